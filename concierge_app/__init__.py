@@ -3,11 +3,20 @@ from __future__ import annotations
 import logging
 import time
 from pathlib import Path
+from typing import Optional
 
 from flask import Flask, g, request
 
-from .agent import ConciergeAgent
+from .admission import (
+    PRIORITY_GUEST,
+    PRIORITY_STAFF,
+    AdmissionController,
+    AdmissionPolicy,
+    setup_admission,
+)
+from .agent import ConciergeAgent, ModelFactory
 from .config import settings
+from .media import MediaManifest, create_media_blueprint
 from services.hotel import HotelManager
 from .observability import ObservabilityConfig, init_logging, setup_request_hooks
 from .profiles import get_profile
@@ -18,15 +27,18 @@ from .tts import SpeechService
 BASE_PATH = Path(__file__).resolve().parent
 
 
-def create_app() -> Flask:
+def create_app(model_factory: Optional[ModelFactory] = None) -> Flask:
     logs_dir = BASE_PATH.parent / "logs"
     logs_dir.mkdir(exist_ok=True)
-    request_logger = init_logging(
-        ObservabilityConfig(
-            requests_log_path=str(logs_dir / "requests.log"),
-            level=logging.INFO,
-        )
+    observability_config = ObservabilityConfig(
+        requests_log_path=str(logs_dir / "requests.log"),
+        level=logging.INFO,
+        admin_token=settings.admin_token,
+        profile_sample_rate=settings.profile_sample_rate,
+        profile_routes=settings.profile_routes,
+        profile_dir=str(logs_dir / "profiles"),
     )
+    request_logger = init_logging(observability_config)
 
     profile = get_profile(settings.concierge_id)
     app = Flask(
@@ -37,13 +49,48 @@ def create_app() -> Flask:
     )
 
     manager = HotelManager()
-    agent = ConciergeAgent(manager, profile=profile)
+    agent = ConciergeAgent(manager, profile=profile, model_factory=model_factory)
     speech_service = SpeechService(default_voice=profile.tts_voice)
+    media_manifest = MediaManifest(BASE_PATH / "static" / "media", profile)
 
-    app.register_blueprint(create_blueprint(manager, agent, speech_service, profile))
-    setup_request_hooks(app, request_logger)
+    app.register_blueprint(create_blueprint(manager, agent, speech_service, profile, media_manifest))
+    app.register_blueprint(create_media_blueprint(media_manifest))
+    setup_request_hooks(app, request_logger, observability_config)
+    setup_admission(app, build_admission_controller())
 
     return app
 
 
-__all__ = ["create_app", "settings"]
+def build_admission_controller() -> AdmissionController:
+    """Admission limits for one worker process (gunicorn.conf.py sizes threads from it)."""
+    timeout = settings.admission_queue_timeout
+    # Staff endpoints are cheap; their caps only guard against runaway clients.
+    staff = AdmissionPolicy(
+        max_concurrent=settings.admission_capacity,
+        max_queue=settings.staff_max_queue,
+        queue_timeout=timeout,
+        priority=PRIORITY_STAFF,
+    )
+    return AdmissionController(
+        capacity=settings.admission_capacity,
+        policies={
+            "/api/status": staff,
+            "/api/checkout": staff,
+            "/api/floor/batch": staff,
+            "/api/chat": AdmissionPolicy(
+                max_concurrent=settings.chat_max_concurrent,
+                max_queue=settings.chat_max_queue,
+                queue_timeout=timeout,
+                priority=PRIORITY_GUEST,
+            ),
+            "/api/tts": AdmissionPolicy(
+                max_concurrent=settings.tts_max_concurrent,
+                max_queue=settings.tts_max_queue,
+                queue_timeout=timeout,
+                priority=PRIORITY_GUEST,
+            ),
+        },
+    )
+
+
+__all__ = ["build_admission_controller", "create_app", "settings"]
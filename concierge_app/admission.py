@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Dict, List
+
+from flask import Flask, g, jsonify, request
+
+from .observability import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED
+
+
+PRIORITY_STAFF = 10
+PRIORITY_GUEST = 0
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    max_concurrent: int
+    max_queue: int
+    queue_timeout: float
+    priority: int = PRIORITY_GUEST
+
+
+class _Waiter:
+    def __init__(self, endpoint: str, priority: int, seq: int) -> None:
+        self.endpoint = endpoint
+        self.priority = priority
+        self.seq = seq
+        self.granted = threading.Event()
+
+
+class AdmissionController:
+    """Per-endpoint concurrency limits sharing one worker-slot budget.
+
+    Each endpoint runs at most ``max_concurrent`` requests and queues at most
+    ``max_queue`` more; anything beyond that is rejected immediately. When a
+    slot frees up, queued requests are admitted highest priority first, so
+    staff operations overtake guest chat when the shared ``capacity`` is
+    saturated.
+
+    Limits are per process: under gunicorn each worker gets its own
+    controller, and queued requests hold a server thread while they wait, so
+    workers need a threaded worker class with at least ``thread_budget()``
+    threads.
+    """
+
+    def __init__(self, capacity: int, policies: Dict[str, AdmissionPolicy]) -> None:
+        self.capacity = capacity
+        self.policies = policies
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._in_flight_total = 0
+        self._in_flight: Dict[str, int] = {name: 0 for name in policies}
+        self._waiters: List[_Waiter] = []
+
+    # --- Helpers -----------------------------------------------------------------
+    def _can_run(self, endpoint: str) -> bool:
+        return (
+            self._in_flight_total < self.capacity
+            and self._in_flight[endpoint] < self.policies[endpoint].max_concurrent
+        )
+
+    def _queued(self, endpoint: str) -> int:
+        return sum(1 for w in self._waiters if w.endpoint == endpoint)
+
+    def _take(self, endpoint: str) -> None:
+        self._in_flight_total += 1
+        self._in_flight[endpoint] += 1
+        ADMISSION_IN_FLIGHT.labels(endpoint=endpoint).set(self._in_flight[endpoint])
+
+    def _grant_waiters(self) -> None:
+        # Called with the lock held.
+        for waiter in sorted(self._waiters, key=lambda w: (-w.priority, w.seq)):
+            if self._in_flight_total >= self.capacity:
+                break
+            if not self._can_run(waiter.endpoint):
+                continue
+            self._waiters.remove(waiter)
+            self._take(waiter.endpoint)
+            ADMISSION_QUEUE_DEPTH.labels(endpoint=waiter.endpoint).set(self._queued(waiter.endpoint))
+            waiter.granted.set()
+
+    # --- Public API ---------------------------------------------------------------
+    def acquire(self, endpoint: str) -> bool:
+        policy = self.policies[endpoint]
+        with self._lock:
+            # Only queued requests that are held back by the shared budget (not
+            # by their own endpoint cap) get to go before us.
+            ahead = any(
+                w.priority >= policy.priority
+                and self._in_flight[w.endpoint] < self.policies[w.endpoint].max_concurrent
+                for w in self._waiters
+            )
+            if not ahead and self._can_run(endpoint):
+                self._take(endpoint)
+                return True
+            if self._queued(endpoint) >= policy.max_queue:
+                ADMISSION_REJECTED.labels(endpoint=endpoint, reason="queue_full").inc()
+                return False
+            waiter = _Waiter(endpoint, policy.priority, next(self._seq))
+            self._waiters.append(waiter)
+            ADMISSION_QUEUE_DEPTH.labels(endpoint=endpoint).set(self._queued(endpoint))
+
+        if waiter.granted.wait(policy.queue_timeout):
+            return True
+        with self._lock:
+            if waiter.granted.is_set():
+                # Granted between the timeout and taking the lock.
+                return True
+            self._waiters.remove(waiter)
+            ADMISSION_QUEUE_DEPTH.labels(endpoint=endpoint).set(self._queued(endpoint))
+        ADMISSION_REJECTED.labels(endpoint=endpoint, reason="timeout").inc()
+        return False
+
+    def release(self, endpoint: str) -> None:
+        with self._lock:
+            self._in_flight_total -= 1
+            self._in_flight[endpoint] -= 1
+            ADMISSION_IN_FLIGHT.labels(endpoint=endpoint).set(self._in_flight[endpoint])
+            self._grant_waiters()
+
+    def thread_budget(self) -> int:
+        """Threads needed to hold every admitted and queued request at once."""
+        return self.capacity + sum(p.max_queue for p in self.policies.values())
+
+    def retry_after(self, endpoint: str) -> int:
+        return max(1, int(round(self.policies[endpoint].queue_timeout)))
+
+
+def setup_admission(app: Flask, controller: AdmissionController) -> None:
+    @app.before_request
+    def _admit():
+        endpoint = request.path
+        if endpoint not in controller.policies:
+            return None
+        if not controller.acquire(endpoint):
+            response = jsonify({"error": "Server busy, please retry shortly."})
+            response.status_code = 503
+            response.headers["Retry-After"] = str(controller.retry_after(endpoint))
+            return response
+        g._admission_endpoint = endpoint
+        return None
+
+    @app.teardown_request
+    def _release(exc=None) -> None:
+        endpoint = g.pop("_admission_endpoint", None)
+        if endpoint is not None:
+            controller.release(endpoint)
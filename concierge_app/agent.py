@@ -1,14 +1,24 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from pathlib import Path
 from typing import Callable, List, Optional, Tuple, Dict, Any
 
 import google.generativeai as genai
 
 from .config import settings
+from .observability import (
+    MODEL_CIRCUIT_OPEN,
+    MODEL_FAILOVERS,
+    MODEL_HEDGES,
+    MODEL_SKIPPED,
+    MODEL_TIMEOUTS,
+)
 from .profiles import ConciergeProfile
+from .resilience import CircuitBreaker, LatencyWindow
 
 LOG_DIR = Path(__file__).resolve().parent.parent / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -20,17 +30,115 @@ if not _logger.handlers:
     _logger.addHandler(handler)
     _logger.setLevel(logging.INFO)
 
+FALLBACK_MODELS = ("gemini-1.5-flash-latest", "gemini-1.5-flash")
+
+ModelFactory = Callable[[str, List[Callable]], Any]
+
+
+# Automatic function calling runs tools on the thread that called
+# send_message, so the attempt driving a call is visible to the tools.
+_attempt_local = threading.local()
+
+
+def _genai_model_factory(model_name: str, tools: List[Callable]) -> genai.GenerativeModel:
+    return genai.GenerativeModel(model_name=model_name, tools=tools)
+
+
+class AgentBusyError(RuntimeError):
+    """Raised when a turn cannot start within ``turn_wait`` seconds."""
+
+
+class _Attempt:
+    """One send_message call on one model for one guest turn."""
+
+    def __init__(self, turn: int, slot: "_ModelSlot") -> None:
+        self.turn = turn
+        self.slot = slot
+        self.abandoned = False
+        self.started_at = 0.0
+        self.future: Future = Future()
+
+
+class _ModelSlot:
+    """One candidate model plus its chat session, breaker and latency stats.
+
+    A slot runs at most one call at a time on its own thread. A call that
+    overran its deadline keeps the slot busy until the SDK returns, and the
+    slot is skipped meanwhile instead of queueing work behind it.
+    """
+
+    def __init__(self, name: str, model: Any) -> None:
+        self.name = name
+        self.model = model
+        self.session = None
+        self.lock = threading.Lock()
+        self.busy = False
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.breaker_failure_threshold,
+            reset_timeout=settings.breaker_reset_seconds,
+        )
+        self.latency = LatencyWindow()
+
 
 class ConciergeAgent:
-    """Thin wrapper around the Gemini model with function-calling tools."""
+    """Thin wrapper around the Gemini model with function-calling tools.
+
+    Every call runs under a deadline against the preferred model and fails over
+    at runtime to the fallback models, replaying the conversation history so
+    the guest does not notice the switch. ``model_factory`` lets tests swap in
+    stub backends (anything with ``start_chat(history=..., ...)``).
 
-    def __init__(self, manager, profile: ConciergeProfile) -> None:
+    All guests share one conversation, so turns run one at a time per
+    process. A turn waits at most ``turn_wait`` seconds for the previous one
+    and then raises ``AgentBusyError`` instead of queueing without bound.
+    """
+
+    def __init__(
+        self,
+        manager,
+        profile: ConciergeProfile,
+        model_factory: Optional[ModelFactory] = None,
+        call_timeout: Optional[float] = None,
+        hedge: Optional[bool] = None,
+        turn_wait: Optional[float] = None,
+    ) -> None:
         self.manager = manager
         self.profile = profile
         self.model: Optional[genai.GenerativeModel] = None
         self.chat_session = None
+        self._init_lock = threading.Lock()
+        self._call_lock = threading.Lock()
+        self._model_factory = model_factory
+        self.call_timeout = call_timeout if call_timeout is not None else settings.model_call_timeout
+        self.hedge = hedge if hedge is not None else settings.model_hedge_enabled
+        self.turn_wait = turn_wait if turn_wait is not None else settings.chat_turn_wait
+        self._slots: List[_ModelSlot] = []
+        self._active: Optional[_ModelSlot] = None
+        self._history: List[Any] = []
+        self._turn = 0
+        self._tool_lock = threading.Lock()
+        self._turn_results: Dict[Tuple[Any, ...], str] = {}
 
     # --------------------------------------------------------------------- tools
+    def _run_tool(self, name: str, args: Tuple[Any, ...], fn: Callable[[], str]) -> str:
+        """Run a state-changing tool at most once per guest turn.
+
+        When a model call times out and the turn is replayed on a fallback (or
+        hedged), the same tool call is answered from the first execution
+        instead of seating or waitlisting the guest twice. Calls that were
+        already abandoned are refused so they cannot touch the floor.
+        """
+        attempt: Optional[_Attempt] = getattr(_attempt_local, "attempt", None)
+        if attempt is None:
+            return fn()
+        with self._tool_lock:
+            if attempt.abandoned:
+                return "This request was superseded; no changes were made."
+            key = (attempt.turn, name, *args)
+            if key not in self._turn_results:
+                self._turn_results[key] = fn()
+            return self._turn_results[key]
+
     def _build_tools(self) -> List[Callable]:
         manager = self.manager
 
@@ -40,13 +148,11 @@ class ConciergeAgent:
                 return f"Table {table.table_id} is available for {party_size} guests."
             return "No table available."
 
-        def add_guest_tool(name: str, party_size: int, action: str = "check_in") -> str:
-            action = (action or "check_in").lower()
+        def _add_guest(name: str, party_size: int, action: str) -> str:
             if action == "check_in":
-                table = manager.check_availability(party_size)
-                if not table:
+                table_id = manager.seat_if_free(party_size, name)
+                if not table_id:
                     return f"No table available for {party_size} guests. Use action='waitlist' to add them to the waitlist."
-                table_id = manager.assign_table(table, name)
                 return f"Assigned table {table_id} to {name}."
             if action == "waitlist":
                 position = manager.add_to_waitlist(name, party_size)
@@ -62,6 +168,12 @@ class ConciergeAgent:
                 return f"Added {name} to waitlist at position {position}."
             return "Invalid action. Use 'check_in' to assign a table or 'waitlist' to add to waitlist."
 
+        def add_guest_tool(name: str, party_size: int, action: str = "check_in") -> str:
+            action = (action or "check_in").lower()
+            return self._run_tool(
+                "add_guest_tool", (name, party_size, action), lambda: _add_guest(name, party_size, action)
+            )
+
         def get_status_tool() -> str:
             return str(manager.get_status())
 
@@ -69,35 +181,209 @@ class ConciergeAgent:
 
     # ------------------------------------------------------------------ lifecycle
     def _init_model(self) -> None:
-        genai.configure(api_key=settings.google_api_key)
+        factory = self._model_factory
+        if factory is None:
+            genai.configure(api_key=settings.google_api_key)
+            factory = _genai_model_factory
         tools = self._build_tools()
 
         preferred = self.profile.model or "gemini-2.5-flash"
-        tried = set()
-        for model_name in (preferred, "gemini-1.5-flash-latest", "gemini-1.5-flash"):
-            if model_name in tried:
+        slots: List[_ModelSlot] = []
+        for model_name in (preferred, *FALLBACK_MODELS):
+            if any(slot.name == model_name for slot in slots):
                 continue
-            tried.add(model_name)
             try:
-                self.model = genai.GenerativeModel(model_name=model_name, tools=tools)
-                self.chat_session = self.model.start_chat(enable_automatic_function_calling=True)
-                self.chat_session.send_message(self.profile.prompt.strip() or "You are the concierge.")
-                return
+                slots.append(_ModelSlot(model_name, factory(model_name, tools)))
             except Exception as exc:  # pragma: no cover - best effort
                 print(f"Failed to init {model_name}: {exc}")
+        if not slots:
+            raise RuntimeError("Unable to initialize any Gemini model.")
 
-        raise RuntimeError("Unable to initialize any Gemini model.")
+        self._slots = slots
+        self._history = []
+        self._active = None
+        # Priming goes through the same failover path as guest messages.
+        _, slot = self._send_with_failover(self.profile.prompt.strip() or "You are the concierge.")
+        # Publish only once primed so lock-free readers never see a bare session.
+        self.model = slot.model
+        self.chat_session = slot.session
+
+    # -------------------------------------------------------------- model calls
+    def _start_call(self, slot: _ModelSlot, message: str) -> Optional[_Attempt]:
+        """Start ``message`` on ``slot``'s own thread, or return None if it is busy."""
+        with slot.lock:
+            if slot.busy:
+                return None
+            slot.busy = True
+        try:
+            if slot is not self._active or slot.session is None:
+                # Carry the conversation over from whichever model answered last.
+                slot.session = slot.model.start_chat(
+                    history=list(self._history), enable_automatic_function_calling=True
+                )
+        except BaseException:
+            with slot.lock:
+                slot.busy = False
+            raise
+        session = slot.session
+        attempt = _Attempt(self._turn, slot)
+        started = threading.Event()
+
+        def _call() -> None:
+            _attempt_local.attempt = attempt
+            attempt.started_at = time.monotonic()
+            attempt.future.set_running_or_notify_cancel()
+            started.set()
+            try:
+                response = session.send_message(message)
+                attempt.future.set_result((response, session, time.monotonic() - attempt.started_at))
+            except BaseException as exc:
+                attempt.future.set_exception(exc)
+            finally:
+                _attempt_local.attempt = None
+                with slot.lock:
+                    slot.busy = False
+
+        threading.Thread(target=_call, name=f"concierge-model-{slot.name}", daemon=True).start()
+        # The deadline counts from when the call is actually running.
+        started.wait()
+        return attempt
+
+    def _abandon(self, attempt: _Attempt) -> None:
+        with self._tool_lock:
+            attempt.abandoned = True
+        # The session may still be mid-call; rebuild it from history next time.
+        attempt.slot.session = None
+        if self._active is attempt.slot:
+            self._active = None
+
+    def _record_failure(self, slot: _ModelSlot) -> None:
+        slot.breaker.record_failure()
+        MODEL_CIRCUIT_OPEN.labels(model=slot.name).set(int(not slot.breaker.allow()))
+
+    def _start_first_free(self, candidates: List[_ModelSlot], idx: int, message: str) -> Tuple[Optional[_Attempt], int]:
+        """Start on the first usable candidate at or after ``idx``; returns the attempt and its index."""
+        while idx < len(candidates):
+            slot = candidates[idx]
+            try:
+                attempt = self._start_call(slot, message)
+            except Exception as exc:
+                _logger.warning("model=%s could not start chat: %s", slot.name, exc)
+                self._record_failure(slot)
+                attempt = None
+            else:
+                if attempt is None:
+                    # Still finishing an abandoned call; not a fresh failure.
+                    _logger.warning("model=%s busy with an abandoned call; skipping", slot.name)
+                    MODEL_SKIPPED.labels(model=slot.name).inc()
+            if attempt is not None:
+                return attempt, idx
+            idx += 1
+        return None, idx
+
+    def _send_with_failover(self, message: str) -> Tuple[Any, _ModelSlot]:
+        with self._tool_lock:
+            self._turn += 1
+            self._turn_results.clear()
+        candidates = [slot for slot in self._slots if slot.breaker.allow()]
+        if not candidates:
+            raise RuntimeError("All Gemini models are unavailable (circuits open).")
+
+        last_error: Optional[BaseException] = None
+        previous: Optional[_ModelSlot] = None
+        idx = 0
+        while True:
+            primary, idx = self._start_first_free(candidates, idx, message)
+            if primary is None:
+                break
+            if previous is not None:
+                MODEL_FAILOVERS.labels(from_model=previous.name, to_model=primary.slot.name).inc()
+                _logger.warning("failing over from model=%s to model=%s", previous.name, primary.slot.name)
+            hedge_after = primary.slot.latency.percentile(95) if self.hedge else None
+            pending: Dict[Future, _Attempt] = {primary.future: primary}
+
+            while pending:
+                now = time.monotonic()
+                deadline = min(a.started_at for a in pending.values()) + self.call_timeout
+                can_hedge = hedge_after is not None and idx + 1 < len(candidates)
+                wait_for = deadline - now
+                if can_hedge:
+                    wait_for = min(wait_for, primary.started_at + hedge_after - now)
+                done, _ = wait(list(pending), timeout=max(0.0, wait_for), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    attempt = pending.pop(future)
+                    slot = attempt.slot
+                    try:
+                        response, session, elapsed = future.result()
+                    except Exception as exc:
+                        _logger.warning("model=%s call failed: %s", slot.name, exc)
+                        last_error = exc
+                        self._abandon(attempt)
+                        self._record_failure(slot)
+                        continue
+                    slot.latency.observe(elapsed)
+                    slot.breaker.record_success()
+                    MODEL_CIRCUIT_OPEN.labels(model=slot.name).set(0)
+                    if attempt is not primary:
+                        MODEL_HEDGES.labels(model=slot.name, outcome="won").inc()
+                    # Any still-running loser is abandoned so its tools become no-ops.
+                    for loser in pending.values():
+                        self._abandon(loser)
+                    self._history = list(session.history)
+                    self._active = slot
+                    return response, slot
+
+                if done or not pending:
+                    continue
+                now = time.monotonic()
+                expired = [a for a in pending.values() if now >= a.started_at + self.call_timeout]
+                for attempt in expired:
+                    _logger.warning(
+                        "model=%s call exceeded %.1fs deadline", attempt.slot.name, self.call_timeout
+                    )
+                    MODEL_TIMEOUTS.labels(model=attempt.slot.name).inc()
+                    pending.pop(attempt.future)
+                    self._abandon(attempt)
+                    self._record_failure(attempt.slot)
+                    last_error = TimeoutError(f"Model call exceeded {self.call_timeout:.1f}s")
+                if not expired and can_hedge:
+                    hedge_after = None
+                    hedge, hedge_idx = self._start_first_free(candidates, idx + 1, message)
+                    if hedge is not None:
+                        idx = hedge_idx
+                        MODEL_HEDGES.labels(model=hedge.slot.name, outcome="sent").inc()
+                        pending[hedge.future] = hedge
+
+            previous = primary.slot
+            idx += 1
+
+        raise RuntimeError("All Gemini models failed.") from last_error
 
     # --------------------------------------------------------------------- public
     def respond(self, message: str) -> Tuple[str, Optional[Dict[str, Any]]]:
-        if not self.chat_session:
-            self._init_model()
         start = time.perf_counter()
-        response = self.chat_session.send_message(message)
+        if not self.chat_session:
+            if not self._init_lock.acquire(timeout=self.turn_wait):
+                raise AgentBusyError("Concierge is still starting up.")
+            try:
+                if not self.chat_session:
+                    self._init_model()
+            finally:
+                self._init_lock.release()
+        # One shared conversation: serialize turns so history stays consistent.
+        if not self._call_lock.acquire(timeout=self.turn_wait):
+            raise AgentBusyError("Concierge is busy with another guest.")
+        try:
+            response, slot = self._send_with_failover(message)
+            self.model = slot.model
+            self.chat_session = slot.session
+        finally:
+            self._call_lock.release()
         elapsed_ms = (time.perf_counter() - start) * 1000
         _logger.info(
             "model=%s chars=%d duration_ms=%.1f",
-            getattr(self.model, "model_name", "unknown"),
+            slot.name,
             len(message or ""),
             elapsed_ms,
         )
@@ -19,6 +19,21 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 PORT = int(os.getenv("PORT", "5001"))
 CONCIERGE_ID = os.getenv("CONCIERGE_ID", "amber")
+ADMISSION_CAPACITY = int(os.getenv("ADMISSION_CAPACITY", "16"))
+CHAT_MAX_CONCURRENT = int(os.getenv("CHAT_MAX_CONCURRENT", "1"))
+CHAT_MAX_QUEUE = int(os.getenv("CHAT_MAX_QUEUE", "8"))
+TTS_MAX_CONCURRENT = int(os.getenv("TTS_MAX_CONCURRENT", "4"))
+TTS_MAX_QUEUE = int(os.getenv("TTS_MAX_QUEUE", "8"))
+STAFF_MAX_QUEUE = int(os.getenv("STAFF_MAX_QUEUE", "4"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+CHAT_TURN_WAIT = float(os.getenv("CHAT_TURN_WAIT", "2.0"))
+MODEL_CALL_TIMEOUT = float(os.getenv("MODEL_CALL_TIMEOUT", "20"))
+MODEL_HEDGE_ENABLED = os.getenv("MODEL_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_ROUTES = tuple(r.strip() for r in os.getenv("PROFILE_ROUTES", "").split(",") if r.strip())
 
 
 class Settings:
@@ -29,6 +44,21 @@ class Settings:
         self.google_credentials = GOOGLE_APPLICATION_CREDENTIALS
         self.port = PORT
         self.concierge_id = CONCIERGE_ID
+        self.admission_capacity = ADMISSION_CAPACITY
+        self.chat_max_concurrent = CHAT_MAX_CONCURRENT
+        self.chat_max_queue = CHAT_MAX_QUEUE
+        self.tts_max_concurrent = TTS_MAX_CONCURRENT
+        self.tts_max_queue = TTS_MAX_QUEUE
+        self.staff_max_queue = STAFF_MAX_QUEUE
+        self.admission_queue_timeout = ADMISSION_QUEUE_TIMEOUT
+        self.chat_turn_wait = CHAT_TURN_WAIT
+        self.model_call_timeout = MODEL_CALL_TIMEOUT
+        self.model_hedge_enabled = MODEL_HEDGE_ENABLED
+        self.breaker_failure_threshold = BREAKER_FAILURE_THRESHOLD
+        self.breaker_reset_seconds = BREAKER_RESET_SECONDS
+        self.admin_token = ADMIN_TOKEN
+        self.profile_sample_rate = PROFILE_SAMPLE_RATE
+        self.profile_routes = PROFILE_ROUTES
 
         if not self.google_api_key:
             raise RuntimeError(
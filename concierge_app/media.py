@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+from flask import Blueprint, abort, send_file
+
+from .profiles import ConciergeProfile
+
+
+ONE_YEAR = 365 * 24 * 60 * 60
+
+_logger = logging.getLogger("concierge.media")
+
+
+@dataclass(frozen=True)
+class MediaAsset:
+    path: Path
+    digest: str
+    size: int
+    url: str
+
+
+def _digest(path: Path) -> str:
+    sha = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class MediaManifest:
+    """Content-hashed avatar clips for one concierge profile.
+
+    Each clip referenced by ``profile.avatars`` is fingerprinted once at
+    startup and exposed as ``/media/<profile>/<stem>.<hash><suffix>``. Because
+    the URL changes whenever the bytes do, responses can be cached forever.
+    Files in the profile folder that no avatar state references are never
+    served. A clip the profile names but that is missing on disk is skipped
+    with a warning, leaving that avatar state blank instead of failing startup.
+    """
+
+    def __init__(self, media_root: Path, profile: ConciergeProfile) -> None:
+        self.profile_id = profile.id
+        self.assets: Dict[str, MediaAsset] = {}
+        self._states: Dict[str, List[str]] = {}
+
+        by_file: Dict[str, MediaAsset] = {}
+        for state, filename in profile.avatars.items():
+            asset = by_file.get(filename)
+            if asset is None:
+                path = media_root / profile.id / filename
+                if not path.is_file():
+                    _logger.warning("profile=%s state=%s missing clip %s", profile.id, state, path)
+                    continue
+                digest = _digest(path)
+                hashed_name = f"{path.stem}.{digest[:12]}{path.suffix}"
+                asset = MediaAsset(
+                    path=path,
+                    digest=digest,
+                    size=path.stat().st_size,
+                    url=f"/media/{profile.id}/{hashed_name}",
+                )
+                by_file[filename] = asset
+                self.assets[hashed_name] = asset
+            self._states.setdefault(asset.url, []).append(state)
+
+    def preload(self, initial_state: str = "idle") -> Dict[str, Any]:
+        """Clips the profile uses, each listing the states it serves.
+
+        The clip for ``initial_state`` (what the kiosk shows on load) comes
+        first; the rest follow smallest first.
+        """
+        clips = sorted(
+            self.assets.values(),
+            key=lambda a: (initial_state not in self._states[a.url], a.size),
+        )
+        return {
+            "profile": self.profile_id,
+            "clips": [
+                {"url": a.url, "size": a.size, "states": self._states[a.url]} for a in clips
+            ],
+        }
+
+
+def create_media_blueprint(manifest: MediaManifest) -> Blueprint:
+    bp = Blueprint("media", __name__)
+
+    @bp.route("/media/<profile_id>/<filename>")
+    def media(profile_id: str, filename: str):
+        asset = manifest.assets.get(filename)
+        if profile_id != manifest.profile_id or asset is None:
+            abort(404)
+        # conditional=True gives us If-None-Match / 304 and byte-range (206)
+        # handling straight from the file, without reading it into memory.
+        response = send_file(
+            asset.path,
+            conditional=True,
+            etag=asset.digest,
+            max_age=ONE_YEAR,
+        )
+        response.headers["Cache-Control"] = f"public, max-age={ONE_YEAR}, immutable"
+        return response
+
+    return bp
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+import hmac
 import logging
+import os
+import random
 import sys
 import time
 import uuid
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Tuple
 
 from flask import Flask, g, request
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+
+from .profiling import RouteProfiler, SamplingProfiler
 
 
 REQUEST_DURATION = Histogram(
@@ -31,12 +37,66 @@ REQUEST_COUNT = Counter(
     "Total HTTP requests",
     ["method", "path", "status"],
 )
+SINGLEFLIGHT_CALLS = Counter(
+    "concierge_singleflight_calls_total",
+    "Calls routed through a single-flight group",
+    ["group"],
+)
+SINGLEFLIGHT_DEDUPLICATED = Counter(
+    "concierge_singleflight_deduplicated_total",
+    "Calls that joined an in-flight call instead of running their own",
+    ["group"],
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "concierge_admission_in_flight",
+    "Requests currently admitted per endpoint",
+    ["endpoint"],
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "concierge_admission_queue_depth",
+    "Requests waiting for admission per endpoint",
+    ["endpoint"],
+)
+ADMISSION_REJECTED = Counter(
+    "concierge_admission_rejected_total",
+    "Requests shed with 503 by admission control",
+    ["endpoint", "reason"],
+)
+MODEL_FAILOVERS = Counter(
+    "concierge_model_failover_total",
+    "Runtime failovers from one model to the next",
+    ["from_model", "to_model"],
+)
+MODEL_HEDGES = Counter(
+    "concierge_model_hedge_total",
+    "Hedged model requests sent after the primary exceeded its p95, and how many won",
+    ["model", "outcome"],
+)
+MODEL_TIMEOUTS = Counter(
+    "concierge_model_timeout_total",
+    "Model calls abandoned after exceeding the per-call deadline",
+    ["model"],
+)
+MODEL_SKIPPED = Counter(
+    "concierge_model_skipped_total",
+    "Attempts skipped because the model was still finishing an abandoned call",
+    ["model"],
+)
+MODEL_CIRCUIT_OPEN = Gauge(
+    "concierge_model_circuit_open",
+    "1 while the model's circuit breaker is open",
+    ["model"],
+)
 
 
 @dataclass
 class ObservabilityConfig:
     requests_log_path: Optional[str] = None
     level: int = logging.INFO
+    admin_token: Optional[str] = None
+    profile_sample_rate: float = 0.0
+    profile_routes: Tuple[str, ...] = ()
+    profile_dir: Optional[str] = None
 
 
 def init_logging(config: ObservabilityConfig) -> logging.Logger:
@@ -56,11 +116,41 @@ def init_logging(config: ObservabilityConfig) -> logging.Logger:
     return logger
 
 
-def setup_request_hooks(app: Flask, logger: logging.Logger) -> None:
+def setup_request_hooks(
+    app: Flask, logger: logging.Logger, config: Optional[ObservabilityConfig] = None
+) -> None:
+    config = config or ObservabilityConfig()
+    sampler = SamplingProfiler()
+    route_profiler = RouteProfiler(Path(config.profile_dir) if config.profile_dir else None)
+
+    def _should_profile(path: str) -> bool:
+        if config.profile_sample_rate <= 0 or path.startswith("/debug/"):
+            return False
+        if config.profile_routes and not path.startswith(config.profile_routes):
+            return False
+        return random.random() < config.profile_sample_rate
+
+    def _admin_denied():
+        if not config.admin_token:
+            return "Not found\n", 404
+        supplied = request.headers.get("X-Admin-Token", "")
+        # compare_digest only accepts ASCII str, so compare bytes.
+        if not hmac.compare_digest(supplied.encode("utf-8"), config.admin_token.encode("utf-8")):
+            return "Forbidden\n", 403
+        return None
+
     @app.before_request
     def _start_timer() -> None:
         g._req_start = time.perf_counter()
         g.request_id = uuid.uuid4().hex
+        if _should_profile(request.path):
+            g._cprofile = route_profiler.start()
+
+    @app.teardown_request
+    def _stop_profile(exc=None) -> None:
+        profiler = g.pop("_cprofile", None)
+        if profiler is not None:
+            route_profiler.stop(request.path, profiler)
 
     @app.after_request
     def _log_and_metrics(response):
@@ -89,3 +179,34 @@ def setup_request_hooks(app: Flask, logger: logging.Logger) -> None:
     @app.route("/metrics")
     def metrics():
         return generate_latest(), 200, {"Content-Type": CONTENT_TYPE_LATEST}
+
+    @app.route("/debug/profile")
+    def debug_profile():
+        denied = _admin_denied()
+        if denied:
+            return denied
+        seconds = min(max(request.args.get("seconds", 10, type=float), 0.1), 60.0)
+        interval = min(max(request.args.get("interval_ms", 10, type=float), 1.0), 1000.0) / 1000
+        stacks = sampler.run(seconds, interval)
+        if stacks is None:
+            return "A profile is already running\n", 409
+        headers = {"Content-Type": "text/plain; charset=utf-8", "X-Profiled-PID": str(os.getpid())}
+        return stacks, 200, headers
+
+    @app.route("/debug/cprofile", methods=["GET", "DELETE"])
+    def debug_cprofile():
+        denied = _admin_denied()
+        if denied:
+            return denied
+        if request.method == "DELETE":
+            route_profiler.reset()
+            return "", 204
+        try:
+            report = route_profiler.report(
+                request.args.get("path"),
+                sort=request.args.get("sort", "cumulative"),
+                limit=request.args.get("limit", 40, type=int),
+            )
+        except KeyError as exc:
+            return f"Unknown sort key: {exc}\n", 400
+        return report, 200, {"Content-Type": "text/plain; charset=utf-8"}
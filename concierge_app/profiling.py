@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import shutil
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+from urllib.parse import quote, unquote
+
+
+class SamplingProfiler:
+    """Wall-clock sampler over every thread in the process.
+
+    Stacks are captured from ``sys._current_frames()`` at a fixed interval on
+    a dedicated thread and returned in collapsed ``frame;frame;frame count``
+    form, ready for flamegraph.pl or speedscope. The calling thread only
+    waits for the result, so under a threaded worker the rest of the process
+    keeps serving traffic while it is profiled.
+    """
+
+    def __init__(self) -> None:
+        self._busy = threading.Lock()
+
+    @staticmethod
+    def _frame_label(frame) -> str:
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+    def _collapse(self, frame, thread_name: str) -> str:
+        labels = []
+        while frame is not None:
+            labels.append(self._frame_label(frame))
+            frame = frame.f_back
+        labels.append(thread_name)
+        return ";".join(reversed(labels))
+
+    def _sample(self, seconds: float, interval: float, skip: Set[int], stacks: Counter) -> None:
+        skip = skip | {threading.get_ident()}
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident in skip:
+                    continue
+                stacks[self._collapse(frame, names.get(ident, str(ident)))] += 1
+            time.sleep(interval)
+
+    def run(self, seconds: float, interval: float = 0.01) -> Optional[str]:
+        """Sample for ``seconds`` and return collapsed stacks, or None if already running."""
+        if not self._busy.acquire(blocking=False):
+            return None
+        try:
+            stacks: Counter = Counter()
+            sampler = threading.Thread(
+                target=self._sample,
+                args=(seconds, interval, {threading.get_ident()}, stacks),
+                name="sampling-profiler",
+                daemon=True,
+            )
+            sampler.start()
+            sampler.join()
+            return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()) + "\n"
+        finally:
+            self._busy.release()
+
+
+class RouteProfiler:
+    """Accumulates cProfile stats for a sampled fraction of requests per route.
+
+    With a ``directory``, each worker process also dumps its per-route stats
+    to ``<directory>/<pid>/``, and reports merge every worker's files, so a
+    report reflects the whole server whichever worker serves it.
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._samples: Counter = Counter()
+
+    @staticmethod
+    def start() -> Optional[cProfile.Profile]:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active on this interpreter (3.12+ allows only one).
+            return None
+        return profiler
+
+    def stop(self, path: str, profiler: cProfile.Profile) -> None:
+        profiler.disable()
+        with self._lock:
+            if self.directory is not None and not self._file(path, ".prof").exists():
+                # Cleared by a reset (possibly from another worker); start over.
+                self._stats.pop(path, None)
+                self._samples.pop(path, None)
+            if path in self._stats:
+                self._stats[path].add(profiler)
+            else:
+                self._stats[path] = pstats.Stats(profiler)
+            self._samples[path] += 1
+            if self.directory is not None:
+                prof = self._file(path, ".prof")
+                prof.parent.mkdir(parents=True, exist_ok=True)
+                self._stats[path].dump_stats(str(prof))
+                self._file(path, ".count").write_text(str(self._samples[path]))
+
+    def _file(self, path: str, suffix: str) -> Path:
+        return self.directory / str(os.getpid()) / f"{quote(path, safe='')}{suffix}"
+
+    def _collect(self) -> Dict[str, Tuple[pstats.Stats, int, int]]:
+        """Per route: merged stats, sampled requests and number of workers."""
+        if self.directory is None:
+            return {path: (stats, self._samples[path], 1) for path, stats in self._stats.items()}
+        merged: Dict[str, Tuple[pstats.Stats, int, int]] = {}
+        for prof in sorted(self.directory.glob("*/*.prof")):
+            path = unquote(prof.stem)
+            count_file = prof.with_suffix(".count")
+            samples = int(count_file.read_text()) if count_file.exists() else 0
+            if path in merged:
+                stats, total, workers = merged[path]
+                stats.add(str(prof))
+                merged[path] = (stats, total + samples, workers + 1)
+            else:
+                merged[path] = (pstats.Stats(str(prof)), samples, 1)
+        return merged
+
+    def report(self, path: Optional[str], sort: str = "cumulative", limit: int = 40) -> str:
+        with self._lock:
+            collected = self._collect()
+            paths = [path] if path else sorted(collected)
+            out = io.StringIO()
+            for key in paths:
+                if key not in collected:
+                    continue
+                stats, samples, workers = collected[key]
+                out.write(f"# {key} ({samples} sampled requests from {workers} worker(s))\n")
+                stats.stream = out
+                stats.sort_stats(sort).print_stats(limit)
+            return out.getvalue() or "no samples\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._samples.clear()
+            if self.directory is not None and self.directory.exists():
+                shutil.rmtree(self.directory, ignore_errors=True)
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 from flask import Blueprint, jsonify, render_template, request
 
+from .agent import AgentBusyError
 
-def create_blueprint(manager, agent, speech_service, profile):
+
+def create_blueprint(manager, agent, speech_service, profile, media_manifest):
     bp = Blueprint("concierge", __name__)
 
     @bp.route("/")
     def index():
-        return render_template("index.html", profile=profile)
+        return render_template("index.html", profile=profile, media=media_manifest.preload())
 
     @bp.route("/api/status")
     def status():
@@ -24,6 +26,25 @@ def create_blueprint(manager, agent, speech_service, profile):
         code = 200 if result.get("success") else 400
         return jsonify(result), code
 
+    @bp.route("/api/floor/batch", methods=["POST"])
+    def floor_batch():
+        payload = request.get_json(force=True, silent=True)
+        if not isinstance(payload, dict):
+            return jsonify(
+                {
+                    "success": False,
+                    "message": "Batch rejected; no changes applied.",
+                    "errors": ["Request body must be a JSON object."],
+                }
+            ), 400
+        result = manager.apply_floor_batch(
+            checkouts=payload.get("checkouts", []),
+            assignments=payload.get("assignments", []),
+            waitlist=payload.get("waitlist", []),
+        )
+        code = 200 if result.get("success") else 400
+        return jsonify(result), code
+
     @bp.route("/api/chat", methods=["POST"])
     def chat():
         payload = request.get_json(force=True, silent=True) or {}
@@ -33,6 +54,11 @@ def create_blueprint(manager, agent, speech_service, profile):
 
         try:
             reply, event = agent.respond(user_message)
+        except AgentBusyError:
+            response = jsonify({"response": "One moment, I'm still helping another guest."})
+            response.status_code = 503
+            response.headers["Retry-After"] = "1"
+            return response
         except Exception as exc:  # pragma: no cover - runtime safety
             print(f"Chat error: {exc}")
             return jsonify({"response": "I had a glitch, could you say that again?"}), 500
@@ -32,6 +32,43 @@ const setAvatar = (mode) => {
 
 setAvatar('idle');
 
+// Clips come from a per-profile manifest (content-hashed, immutable URLs),
+// ordered with the idle clip first and the rest smallest first. Each clip
+// gets a bounded wait so a browser that never buffers a paused video (iOS
+// Safari ignores preload) cannot stall the clips after it.
+const CLIP_LOAD_TIMEOUT_MS = 4000;
+
+const waitForClip = (video) =>
+  new Promise((resolve) => {
+    const done = () => {
+      clearTimeout(timer);
+      video.removeEventListener('loadeddata', done);
+      video.removeEventListener('error', done);
+      resolve();
+    };
+    const timer = setTimeout(done, CLIP_LOAD_TIMEOUT_MS);
+    video.addEventListener('loadeddata', done);
+    video.addEventListener('error', done);
+  });
+
+const loadAvatarClips = async () => {
+  const manifestEl = document.getElementById('media-manifest');
+  const manifest = manifestEl ? JSON.parse(manifestEl.textContent) : { clips: [] };
+  for (const clip of manifest.clips) {
+    const targets = clip.states.map((state) => videos[state]).filter(Boolean);
+    if (!targets.length) continue;
+    targets.forEach((video) => {
+      video.preload = 'auto';
+      video.src = clip.url;
+      if (video.classList.contains('active')) {
+        video.play().catch((err) => console.log('Avatar play error', err));
+      }
+    });
+    await waitForClip(targets[0]);
+  }
+};
+loadAvatarClips();
+
 const restartRecognition = (delay = 0) => {
   setTimeout(() => {
     if (
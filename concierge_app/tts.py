@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 import logging
+import threading
 import time
 from pathlib import Path
 from typing import Optional
@@ -9,6 +10,7 @@ from typing import Optional
 from google.cloud import texttospeech
 
 from .config import settings
+from .singleflight import SingleFlight
 
 
 LOG_DIR = Path(__file__).resolve().parent.parent / "logs"
@@ -28,6 +30,8 @@ class SpeechService:
     def __init__(self, default_voice: str = "en-IN-Standard-E") -> None:
         self._client: Optional[texttospeech.TextToSpeechClient] = None
         self.default_voice = default_voice
+        self._init_lock = threading.Lock()
+        self._inflight = SingleFlight("tts")
 
     def _init_client(self) -> None:
         try:
@@ -38,7 +42,9 @@ class SpeechService:
 
     def _ensure_client(self) -> bool:
         if not self._client:
-            self._init_client()
+            with self._init_lock:
+                if not self._client:
+                    self._init_client()
         return self._client is not None
 
     @property
@@ -48,10 +54,14 @@ class SpeechService:
     def synthesize(self, text: str, voice: str | None = None) -> Optional[str]:
         if not self._ensure_client():
             return None
+        voice = voice or self.default_voice
+        # Identical concurrent requests (e.g. several kiosks announcing the same
+        # table) share one synthesize_speech round trip.
+        return self._inflight.do((voice, text), lambda: self._synthesize(text, voice))
 
+    def _synthesize(self, text: str, voice: str) -> Optional[str]:
         try:
             start = time.perf_counter()
-            voice = voice or self.default_voice
             synthesis_input = texttospeech.SynthesisInput(text=text)
             lang_parts = voice.split("-")
             language_code = "-".join(lang_parts[:2]) if len(lang_parts) >= 2 else "en-US"
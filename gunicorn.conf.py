@@ -0,0 +1,17 @@
+"""Gunicorn settings, picked up automatically from the project root.
+
+Admission control needs a threaded worker: with the default sync worker each
+process serves one request at a time, so a slow /api/chat would still block
+staff polls. Every admitted or queued request holds a thread, so threads are
+sized from the per-process admission limits.
+"""
+import os
+
+from concierge_app import build_admission_controller, settings
+
+
+bind = f"0.0.0.0:{settings.port}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "gthread"
+# A few spare threads for /metrics, /debug, the index page and static files.
+threads = build_admission_controller().thread_budget() + 4
@@ -0,0 +1,96 @@
+"""Measure staff-endpoint latency while /api/chat is flooded.
+
+Run against a live server:
+
+    python scripts/load_test.py --base-url http://127.0.0.1:5001 --chat-clients 32
+
+With admission control enabled, /api/status latency should stay flat and
+surplus chat requests should come back as fast 503s instead of piling up.
+tests/test_admission_load.py covers the same scenario in-process with a stub
+model backend that injects latency.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from typing import List, Optional
+
+
+def _request(url: str, payload: Optional[dict] = None, timeout: float = 60.0) -> int:
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except Exception:
+        return 0
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:5001")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--chat-clients", type=int, default=32)
+    parser.add_argument("--status-interval", type=float, default=0.2)
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    chat_codes: Counter = Counter()
+    status_ms: List[float] = []
+    status_codes: Counter = Counter()
+    lock = threading.Lock()
+
+    def chat_client() -> None:
+        while not stop.is_set():
+            code = _request(f"{args.base_url}/api/chat", {"message": "Table for two please"})
+            with lock:
+                chat_codes[code] += 1
+
+    def status_poller() -> None:
+        while not stop.is_set():
+            start = time.perf_counter()
+            code = _request(f"{args.base_url}/api/status")
+            with lock:
+                status_ms.append((time.perf_counter() - start) * 1000)
+                status_codes[code] += 1
+            time.sleep(args.status_interval)
+
+    threads = [threading.Thread(target=chat_client, daemon=True) for _ in range(args.chat_clients)]
+    threads.append(threading.Thread(target=status_poller, daemon=True))
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+
+    print(f"chat responses by status: {dict(chat_codes)}")
+    print(f"status responses by status: {dict(status_codes)}")
+    if status_ms:
+        print(
+            "status latency ms: p50={:.1f} p95={:.1f} p99={:.1f} mean={:.1f}".format(
+                _percentile(status_ms, 50),
+                _percentile(status_ms, 95),
+                _percentile(status_ms, 99),
+                statistics.mean(status_ms),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 import datetime
+import threading
 
 
 @dataclass
@@ -37,6 +39,8 @@ class HotelManager:
     waitlist: List[WaitlistEntry] = field(default_factory=list)
     last_event: Optional[Dict[str, Any]] = None
     default_dining_duration_minutes: int = 50 # New configurable attribute
+    # Guards floor changes; agent tools, staff requests and batches run on different threads.
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.tables:
@@ -53,6 +57,36 @@ class HotelManager:
     def _find_table(self, table_id: str) -> Optional[Table]:
         return next((t for t in self.tables if t.table_id == table_id), None)
 
+    def _seat(self, table: Table, guest_name: str) -> None:
+        table.status = "occupied"
+        table.guest_name = guest_name
+        table.assigned_time = datetime.datetime.now()
+
+    def _fill_waitlist(self) -> List[Dict[str, Any]]:
+        """Seat waiting parties on free tables in one pass.
+
+        Parties are served in waitlist order, each on the smallest free table
+        that fits, so large tables stay open for large parties further down.
+        """
+        free = sorted(
+            (t for t in self.tables if t.status == "free"),
+            key=lambda t: t.seats,
+        )
+        seats = [t.seats for t in free]
+        seated: List[Dict[str, Any]] = []
+        remaining: List[WaitlistEntry] = []
+        for entry in self.waitlist:
+            idx = bisect_left(seats, entry.party_size)
+            if idx == len(free):
+                remaining.append(entry)
+                continue
+            table = free.pop(idx)
+            seats.pop(idx)
+            self._seat(table, entry.name)
+            seated.append({"table": table.table_id, "name": entry.name, "party_size": entry.party_size})
+        self.waitlist = remaining
+        return seated
+
     def _record_event(self, event: Dict[str, Any]) -> None:
         self.last_event = event
 
@@ -70,6 +104,11 @@ class HotelManager:
 
     # --- Public API ---------------------------------------------------------------
     def get_status(self) -> Dict[str, Any]:
+        # Held so a poll never sees a batch half-applied.
+        with self._lock:
+            return self._status()
+
+    def _status(self) -> Dict[str, Any]:
         current_time = datetime.datetime.now()
 
         # Create a mutable copy of tables for simulation
@@ -120,76 +159,207 @@ class HotelManager:
         }
 
     def check_availability(self, party_size: int) -> Optional[Table]:
-        return next(
-            (t for t in self.tables if t.status == "free" and t.seats >= party_size),
-            None,
-        )
-
-    def assign_table(self, table: Table, guest_name: str) -> str:
-        table.status = "occupied"
-        table.guest_name = guest_name
-        table.assigned_time = datetime.datetime.now() # Set assigned time
-        self._record_event(
-            {
-                "type": "table_assigned",
-                "table": table.table_id,
-                "name": guest_name,
-                "party_size": table.seats,
-            }
-        )
-        return table.table_id
-
-    def add_to_waitlist(self, name: str, party_size: int) -> int:
-        self.waitlist.append(WaitlistEntry(name=name, party_size=party_size))
-        position = len(self.waitlist)
-        self._record_event(
-            {
-                "type": "waitlist",
-                "name": name,
-                "party_size": party_size,
-                "position": position,
-            }
-        )
-        return position
-
-    def checkout_and_fill_waitlist(self, table_id: str) -> Dict[str, Any]:
-        table = self._find_table(table_id)
-        if not table:
-            return {"success": False, "message": "Table not found."}
-
-        previous_guest = table.guest_name
-        table.status = "free"
-        table.guest_name = None
-        table.assigned_time = None # Reset assigned time on checkout
-
-        assigned_guest: Optional[WaitlistEntry] = None
-        for idx, entry in enumerate(list(self.waitlist)):
-            if entry.party_size <= table.seats:
-                assigned_guest = self.waitlist.pop(idx)
-                table.status = "occupied"
-                table.guest_name = assigned_guest.name
-                table.assigned_time = datetime.datetime.now() # Set assigned time for new assignment
-                break
+        with self._lock:
+            return next(
+                (t for t in self.tables if t.status == "free" and t.seats >= party_size),
+                None,
+            )
 
-        result: Dict[str, Any] = {
-            "success": True,
-            "table": table.table_id,
-            "cleared_guest": previous_guest,
-            "assigned_guest": assigned_guest.__dict__ if assigned_guest else None,
-        }
+    def seat_if_free(self, party_size: int, guest_name: str) -> Optional[str]:
+        """Find a free table and seat the guest under one lock hold; None if none fits."""
+        with self._lock:
+            table = self.check_availability(party_size)
+            if not table:
+                return None
+            return self.assign_table(table, guest_name)
 
-        if assigned_guest:
+    def assign_table(self, table: Table, guest_name: str) -> str:
+        with self._lock:
+            if table.status != "free":
+                raise ValueError(f"Table {table.table_id} is already occupied.")
+            table.status = "occupied"
+            table.guest_name = guest_name
+            table.assigned_time = datetime.datetime.now() # Set assigned time
             self._record_event(
                 {
                     "type": "table_assigned",
                     "table": table.table_id,
-                    "name": assigned_guest.name,
-                    "party_size": assigned_guest.party_size,
+                    "name": guest_name,
+                    "party_size": table.seats,
                 }
             )
-            result["announcement"] = (
-                f"Party for {assigned_guest.name}, your table {table.table_id} is ready!"
+            return table.table_id
+
+    def add_to_waitlist(self, name: str, party_size: int) -> int:
+        with self._lock:
+            self.waitlist.append(WaitlistEntry(name=name, party_size=party_size))
+            position = len(self.waitlist)
+            self._record_event(
+                {
+                    "type": "waitlist",
+                    "name": name,
+                    "party_size": party_size,
+                    "position": position,
+                }
             )
+            return position
 
-        return result
+    def checkout_and_fill_waitlist(self, table_id: str) -> Dict[str, Any]:
+        with self._lock:
+            table = self._find_table(table_id)
+            if not table:
+                return {"success": False, "message": "Table not found."}
+
+            previous_guest = table.guest_name
+            table.status = "free"
+            table.guest_name = None
+            table.assigned_time = None # Reset assigned time on checkout
+
+            assigned_guest: Optional[WaitlistEntry] = None
+            for idx, entry in enumerate(list(self.waitlist)):
+                if entry.party_size <= table.seats:
+                    assigned_guest = self.waitlist.pop(idx)
+                    table.status = "occupied"
+                    table.guest_name = assigned_guest.name
+                    table.assigned_time = datetime.datetime.now() # Set assigned time for new assignment
+                    break
+
+            result: Dict[str, Any] = {
+                "success": True,
+                "table": table.table_id,
+                "cleared_guest": previous_guest,
+                "assigned_guest": assigned_guest.__dict__ if assigned_guest else None,
+            }
+
+            if assigned_guest:
+                self._record_event(
+                    {
+                        "type": "table_assigned",
+                        "table": table.table_id,
+                        "name": assigned_guest.name,
+                        "party_size": assigned_guest.party_size,
+                    }
+                )
+                result["announcement"] = (
+                    f"Party for {assigned_guest.name}, your table {table.table_id} is ready!"
+                )
+
+            return result
+
+    def apply_floor_batch(
+        self,
+        checkouts: List[str] = (),
+        assignments: List[Dict[str, Any]] = (),
+        waitlist: List[Dict[str, Any]] = (),
+    ) -> Dict[str, Any]:
+        """Apply many checkouts, seatings and waitlist inserts as one change.
+
+        The whole batch is validated before anything is touched, so it either
+        applies completely or not at all, and the floor lock is held
+        throughout so no other change can slip in between. Freed tables are then matched to the
+        waitlist in a single pass and one ``floor_batch`` event is recorded.
+        """
+        with self._lock:
+            return self._apply_floor_batch(checkouts, assignments, waitlist)
+
+    @staticmethod
+    def _party_size(value: Any) -> Optional[int]:
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, int):
+            return value if value >= 1 else None
+        if isinstance(value, str) and value.isdigit() and int(value) >= 1:
+            return int(value)
+        return None
+
+    def _apply_floor_batch(self, checkouts: Any, assignments: Any, waitlist: Any) -> Dict[str, Any]:
+        errors: List[str] = []
+        for label, value in (("checkouts", checkouts), ("assignments", assignments), ("waitlist", waitlist)):
+            if not isinstance(value, (list, tuple)):
+                errors.append(f"{label} must be a list.")
+        if errors:
+            return {"success": False, "message": "Batch rejected; no changes applied.", "errors": errors}
 
+        tables = {t.table_id: t for t in self.tables}
+
+        freed = set()
+        for table_id in checkouts:
+            if not isinstance(table_id, str):
+                errors.append(f"Invalid checkout {table_id!r}: expected a table id.")
+            elif table_id not in tables:
+                errors.append(f"Table {table_id} not found.")
+            elif table_id in freed:
+                errors.append(f"Table {table_id} checked out twice.")
+            else:
+                freed.add(table_id)
+
+        claimed = set()
+        for item in assignments:
+            if not isinstance(item, dict):
+                errors.append(f"Invalid assignment {item!r}: expected an object.")
+                continue
+            table_id, name = item.get("table_id"), item.get("name")
+            party_size = self._party_size(item.get("party_size", 1))
+            if not isinstance(table_id, str) or table_id not in tables or not isinstance(name, str) or not name:
+                errors.append(f"Invalid assignment {item!r}: table_id and name required.")
+            elif table_id in claimed:
+                errors.append(f"Table {table_id} assigned twice.")
+            elif tables[table_id].status != "free" and table_id not in freed:
+                errors.append(f"Table {table_id} is occupied.")
+            elif party_size is None:
+                errors.append(f"Invalid party_size for table {table_id}.")
+            elif party_size > tables[table_id].seats:
+                errors.append(f"Table {table_id} seats only {tables[table_id].seats}.")
+            else:
+                claimed.add(table_id)
+
+        new_entries: List[WaitlistEntry] = []
+        for item in waitlist:
+            if not isinstance(item, dict):
+                errors.append(f"Invalid waitlist entry {item!r}: expected an object.")
+                continue
+            name = item.get("name")
+            party_size = self._party_size(item.get("party_size"))
+            if not isinstance(name, str) or not name or party_size is None:
+                errors.append(f"Invalid waitlist entry {item!r}: name and party_size required.")
+            else:
+                new_entries.append(WaitlistEntry(name=name, party_size=party_size))
+
+        if errors:
+            return {"success": False, "message": "Batch rejected; no changes applied.", "errors": errors}
+
+        cleared = []
+        for table_id in checkouts:
+            table = tables[table_id]
+            cleared.append({"table": table_id, "cleared_guest": table.guest_name})
+            table.status = "free"
+            table.guest_name = None
+            table.assigned_time = None
+
+        assigned = []
+        for item in assignments:
+            self._seat(tables[item["table_id"]], item["name"])
+            assigned.append({"table": item["table_id"], "name": item["name"]})
+
+        self.waitlist.extend(new_entries)
+        seated = self._fill_waitlist()
+
+        result: Dict[str, Any] = {
+            "success": True,
+            "checked_out": cleared,
+            "assigned": assigned,
+            "seated_from_waitlist": seated,
+            "waitlist_length": len(self.waitlist),
+            "announcements": [
+                f"Party for {s['name']}, your table {s['table']} is ready!" for s in seated
+            ],
+        }
+        self._record_event(
+            {
+                "type": "floor_batch",
+                "checked_out": [c["table"] for c in cleared],
+                "assigned": assigned,
+                "seated_from_waitlist": seated,
+            }
+        )
+        return result
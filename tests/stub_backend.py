@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+
+class StubResponse:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class StubSession:
+    def __init__(self, backend: "StubBackend", model: "StubModel", history: List[str]) -> None:
+        self.backend = backend
+        self.model = model
+        self.history = list(history)
+
+    def send_message(self, message: str) -> StubResponse:
+        backend = self.backend
+        name = self.model.name
+        with backend.lock:
+            backend.calls.append((name, message))
+        script = backend.scripts.get(name)
+        if script is not None:
+            script(message, self.model.tools)
+        delay = backend.latency.get(name, 0.0)
+        if delay:
+            # Waiting on an event lets tests release stragglers at teardown.
+            backend.release.wait(delay)
+        if name in backend.failing:
+            raise RuntimeError(f"{name} unavailable")
+        self.history.extend([message, f"{name}:{message}"])
+        return StubResponse(f"{name}:{message}")
+
+
+class StubModel:
+    def __init__(self, backend: "StubBackend", name: str, tools: List[Callable]) -> None:
+        self.backend = backend
+        self.name = name
+        self.model_name = name
+        self.tools = {tool.__name__: tool for tool in tools}
+
+    def start_chat(self, history=None, enable_automatic_function_calling: bool = False) -> StubSession:
+        return StubSession(self.backend, self, list(history or []))
+
+
+class StubBackend:
+    """Stand-in for Gemini with per-model latency, failures and tool scripts.
+
+    Pass ``backend.factory`` as ``ConciergeAgent(model_factory=...)``. A script
+    runs before the injected latency, the way automatic function calling
+    would invoke tools mid-call.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.latency: Dict[str, float] = {}
+        self.failing: Set[str] = set()
+        self.scripts: Dict[str, Callable[[str, Dict[str, Callable]], None]] = {}
+        self.calls: List[tuple] = []
+        self.release = threading.Event()
+
+    def factory(self, name: str, tools: List[Callable]) -> StubModel:
+        return StubModel(self, name, tools)
+
+    def calls_to(self, name: str, message: Optional[str] = None) -> int:
+        with self.lock:
+            return sum(1 for n, m in self.calls if n == name and (message is None or m == message))
@@ -0,0 +1,91 @@
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+from werkzeug.serving import make_server
+
+import concierge_app
+from concierge_app import agent as agent_module
+from tests.stub_backend import StubBackend
+
+
+MODELS = ("gemini-2.5-flash", "gemini-1.5-flash-latest", "gemini-1.5-flash")
+
+
+def _request(url, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            resp.read()
+            return resp.status, dict(resp.headers), time.perf_counter() - start
+    except urllib.error.HTTPError as exc:
+        return exc.code, dict(exc.headers), time.perf_counter() - start
+
+
+@pytest.fixture
+def degraded_server(monkeypatch):
+    settings = concierge_app.settings
+    # One chat turn runs at a time per worker, so admit one and queue two.
+    monkeypatch.setattr(settings, "chat_max_concurrent", 1)
+    monkeypatch.setattr(settings, "chat_max_queue", 2)
+    monkeypatch.setattr(settings, "admission_queue_timeout", 0.5)
+    monkeypatch.setattr(settings, "chat_turn_wait", 0.5)
+    monkeypatch.setattr(agent_module.settings, "model_call_timeout", 10.0)
+
+    backend = StubBackend()
+    app = concierge_app.create_app(model_factory=backend.factory)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    # Prime the model session while the backend is still healthy.
+    assert _request(f"{base}/api/chat", {"message": "hello"})[0] == 200
+    for name in MODELS:
+        backend.latency[name] = 1.0
+    yield base
+    backend.release.set()
+    server.shutdown()
+
+
+def test_staff_latency_stays_flat_while_chat_is_degraded(degraded_server):
+    base = degraded_server
+    baseline = [_request(f"{base}/api/status")[2] for _ in range(10)]
+
+    stop = threading.Event()
+    chat_results = []
+
+    def chat_client():
+        while not stop.is_set():
+            chat_results.append(_request(f"{base}/api/chat", {"message": "table for two"}))
+
+    clients = [threading.Thread(target=chat_client) for _ in range(12)]
+    for client in clients:
+        client.start()
+    time.sleep(0.3)
+
+    loaded = []
+    for _ in range(20):
+        status, _, elapsed = _request(f"{base}/api/status")
+        assert status == 200
+        loaded.append(elapsed)
+        time.sleep(0.05)
+
+    stop.set()
+    for client in clients:
+        client.join()
+
+    # Staff polls are unaffected by the one-second model backend.
+    assert max(loaded) < 0.25
+    assert statistics.median(loaded) < max(statistics.median(baseline) * 5, 0.05)
+
+    # Surplus chat is shed quickly instead of queueing behind the model.
+    shed = [(headers, elapsed) for code, headers, elapsed in chat_results if code == 503]
+    assert shed
+    assert all(headers.get("Retry-After") == "1" for headers, _ in shed)
+    assert all(elapsed < 1.0 for _, elapsed in shed)
@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+
+from concierge_app import agent as agent_module
+from concierge_app.agent import AgentBusyError, ConciergeAgent
+from concierge_app.profiles import get_profile
+from services.hotel import HotelManager
+from tests.stub_backend import StubBackend
+
+
+PRIMARY = "gemini-2.5-flash"
+FALLBACK = "gemini-1.5-flash-latest"
+
+
+@pytest.fixture
+def backend():
+    stub = StubBackend()
+    yield stub
+    stub.release.set()
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    def configure(threshold=3, reset=30.0):
+        monkeypatch.setattr(agent_module.settings, "breaker_failure_threshold", threshold)
+        monkeypatch.setattr(agent_module.settings, "breaker_reset_seconds", reset)
+
+    configure()
+    return configure
+
+
+def make_agent(backend, manager=None, **kwargs):
+    kwargs.setdefault("call_timeout", 0.2)
+    kwargs.setdefault("hedge", False)
+    return ConciergeAgent(
+        manager or HotelManager(), get_profile("amber"), model_factory=backend.factory, **kwargs
+    )
+
+
+def test_timeout_fails_over_and_carries_history(backend, breaker):
+    agent = make_agent(backend)
+    assert agent.respond("hi")[0] == f"{PRIMARY}:hi"
+
+    backend.latency[PRIMARY] = 5
+    reply, _ = agent.respond("table for two")
+
+    assert reply == f"{FALLBACK}:table for two"
+    history = agent.chat_session.history
+    assert "hi" in history and f"{PRIMARY}:hi" in history
+    assert history[-1] == f"{FALLBACK}:table for two"
+
+
+def test_breaker_opens_and_stops_calling_primary(backend, breaker):
+    breaker(threshold=2)
+    agent = make_agent(backend)
+    agent.respond("hi")
+
+    backend.failing.add(PRIMARY)
+    for i in range(5):
+        assert agent.respond(f"msg {i}")[0] == f"{FALLBACK}:msg {i}"
+
+    assert backend.calls_to(PRIMARY, "msg 2") == 0
+    assert backend.calls_to(PRIMARY, "msg 4") == 0
+
+
+def test_hung_primary_does_not_exhaust_fallbacks(backend, breaker):
+    # A short reset keeps retrying the hung primary, which used to pile up
+    # stragglers until healthy fallbacks timed out behind them.
+    breaker(threshold=1, reset=0.05)
+    agent = make_agent(backend)
+    agent.respond("hi")
+
+    backend.latency[PRIMARY] = 60
+    for i in range(20):
+        start = time.monotonic()
+        assert agent.respond(f"msg {i}")[0] == f"{FALLBACK}:msg {i}"
+        assert time.monotonic() - start < 1.0
+        time.sleep(0.06)
+
+    # Only the first call reached the hung model; later ones skipped it.
+    assert backend.calls_to(PRIMARY) == 3  # prompt, "hi", "msg 0"
+
+
+def test_hedge_answers_before_primary_deadline(backend, breaker):
+    agent = make_agent(backend, call_timeout=5.0, hedge=True)
+    for i in range(25):
+        agent.respond(f"warm {i}")
+
+    backend.latency[PRIMARY] = 2
+    start = time.monotonic()
+    reply, _ = agent.respond("quick")
+
+    assert reply == f"{FALLBACK}:quick"
+    assert time.monotonic() - start < 1.0
+
+
+def test_replayed_turn_seats_guest_once(backend, breaker):
+    manager = HotelManager()
+    agent = make_agent(backend, manager=manager)
+    agent.respond("hi")
+
+    def seat(message, tools):
+        if message == "Ana, two please":
+            tools["add_guest_tool"]("Ana", 2, "check_in")
+
+    backend.scripts[PRIMARY] = seat
+    backend.scripts[FALLBACK] = seat
+    backend.latency[PRIMARY] = 5
+    reply, event = agent.respond("Ana, two please")
+
+    assert reply.startswith(FALLBACK)
+    assert [t.guest_name for t in manager.tables if t.status == "occupied"] == ["Ana"]
+    assert event["type"] == "table_assigned"
+
+
+def test_abandoned_call_cannot_change_floor(backend, breaker):
+    manager = HotelManager()
+    agent = make_agent(backend, manager=manager)
+    agent.respond("hi")
+
+    def late_waitlist(message, tools):
+        time.sleep(0.4)
+        tools["add_guest_tool"]("Bo", 4, "waitlist")
+
+    backend.scripts[PRIMARY] = late_waitlist
+    agent.respond("Bo, four please")
+    time.sleep(0.5)
+
+    assert manager.waitlist == []
+    assert manager.consume_event() is None
+
+
+def test_turn_waits_a_bounded_time_for_the_previous_turn(backend, breaker):
+    agent = make_agent(backend, call_timeout=5.0, turn_wait=0.1)
+    agent.respond("hi")
+
+    backend.latency[PRIMARY] = 1.0
+    slow = threading.Thread(target=agent.respond, args=("slow turn",))
+    slow.start()
+    time.sleep(0.1)
+    start = time.monotonic()
+    with pytest.raises(AgentBusyError):
+        agent.respond("impatient")
+    assert time.monotonic() - start < 0.5
+    slow.join()
@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+from flask import Flask
+
+from concierge_app.routes import create_blueprint
+from services.hotel import HotelManager
+
+
+def occupied(manager):
+    return {t.table_id: t.guest_name for t in manager.tables if t.status == "occupied"}
+
+
+def test_batch_checks_out_assigns_and_fills_waitlist_best_fit():
+    manager = HotelManager()
+    for table_id in ("T6-1", "T4-1", "T2-1"):
+        manager.assign_table(manager._find_table(table_id), "old")
+    for table in manager.tables:
+        if table.status == "free":
+            manager.assign_table(table, "busy")
+    manager.add_to_waitlist("Ana", 2)
+    manager.add_to_waitlist("Cy", 6)
+    manager.consume_event()
+
+    result = manager.apply_floor_batch(
+        checkouts=["T6-1", "T4-1", "T2-1"],
+        assignments=[{"table_id": "T4-1", "name": "Bo", "party_size": 3}],
+        waitlist=[{"name": "Di", "party_size": 1}],
+    )
+
+    assert result["success"]
+    floor = occupied(manager)
+    assert floor["T4-1"] == "Bo"
+    # Ana takes the two-top, leaving the six-top for Cy.
+    assert floor["T2-1"] == "Ana" and floor["T6-1"] == "Cy"
+    assert [e.name for e in manager.waitlist] == ["Di"]
+    assert manager.consume_event()["type"] == "floor_batch"
+    assert manager.consume_event() is None
+
+
+@pytest.mark.parametrize(
+    "batch",
+    [
+        {"checkouts": "T2-1"},
+        {"checkouts": [["T2-1"]]},
+        {"assignments": ["T2-2"]},
+        {"assignments": [{"table_id": ["a"], "name": "Ed"}]},
+        {"assignments": [{"table_id": "T2-2", "name": "Ed", "party_size": "two"}]},
+        {"waitlist": ["x"]},
+        {"waitlist": [{"name": "Ed", "party_size": 0}]},
+        {"checkouts": ["T2-1"], "waitlist": [{"name": "Ed"}]},
+        ["T2-1"],
+    ],
+)
+def test_malformed_batch_is_rejected_without_changes(batch):
+    manager = HotelManager()
+    manager.assign_table(manager._find_table("T2-1"), "Ann")
+    before = occupied(manager)
+    app = Flask(__name__)
+    app.register_blueprint(create_blueprint(manager, None, None, None, None))
+
+    response = app.test_client().post("/api/floor/batch", json=batch)
+    result = response.get_json()
+
+    assert response.status_code == 400
+    assert result["success"] is False
+    assert result["errors"]
+    assert occupied(manager) == before
+    assert manager.waitlist == []
+
+
+def test_batch_holds_lock_against_concurrent_assign():
+    manager = HotelManager()
+    table = manager._find_table("T2-1")
+    results = {}
+
+    with manager._lock:
+        worker = threading.Thread(
+            target=lambda: results.update(
+                batch=manager.apply_floor_batch(assignments=[{"table_id": "T2-1", "name": "Batch"}])
+            )
+        )
+        worker.start()
+        # The batch cannot validate until the guest below is seated.
+        manager.assign_table(table, "Walk-in")
+    worker.join()
+
+    assert results["batch"]["success"] is False
+    assert table.guest_name == "Walk-in"
+
+
+def test_assign_refuses_a_table_seated_since_the_availability_check():
+    manager = HotelManager()
+    table = manager.check_availability(2)
+    manager.apply_floor_batch(assignments=[{"table_id": table.table_id, "name": "Priya"}])
+
+    with pytest.raises(ValueError):
+        manager.assign_table(table, "Walk-in")
+    assert table.guest_name == "Priya"
+    # The agent's check-and-seat picks another table instead.
+    assert manager.seat_if_free(2, "Walk-in") not in (None, table.table_id)
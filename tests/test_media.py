@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from concierge_app.media import MediaManifest
+from concierge_app.profiles import ConciergeProfile, get_profile
+
+
+MEDIA_ROOT = Path(__file__).resolve().parent.parent / "concierge_app" / "static" / "media"
+
+
+def test_idle_clip_loads_first_then_smallest():
+    clips = MediaManifest(MEDIA_ROOT, get_profile("amber")).preload()["clips"]
+
+    assert clips[0]["states"] == ["idle"]
+    rest = [clip["size"] for clip in clips[1:]]
+    assert rest == sorted(rest)
+
+
+def test_shared_clip_is_listed_once():
+    clips = MediaManifest(MEDIA_ROOT, get_profile("maya")).preload()["clips"]
+
+    assert clips[0]["states"] == ["idle", "listening"]
+    assert len(clips) == 2
+
+
+def test_missing_clip_is_skipped_instead_of_failing_startup(tmp_path, caplog):
+    (tmp_path / "kiosk").mkdir()
+    (tmp_path / "kiosk" / "avatar-idle.mp4").write_bytes(b"idle")
+    profile = ConciergeProfile(
+        id="kiosk",
+        display_name="Kiosk",
+        description="",
+        avatars={"idle": "avatar-idle.mp4", "speaking": "avatar-speaking.mp4"},
+    )
+
+    clips = MediaManifest(tmp_path, profile).preload()["clips"]
+
+    assert [clip["states"] for clip in clips] == [["idle"]]
+    assert "avatar-speaking.mp4" in caplog.text
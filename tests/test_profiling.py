@@ -0,0 +1,79 @@
+import logging
+import threading
+import time
+
+from flask import Flask
+
+from concierge_app import profiling
+from concierge_app.observability import ObservabilityConfig, setup_request_hooks
+from concierge_app.profiling import RouteProfiler, SamplingProfiler
+
+
+def _busy(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampler_returns_stacks_of_other_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        stacks = SamplingProfiler().run(0.3, 0.01)
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = stacks.splitlines()
+    assert any(line.startswith("busy-worker;") and "_busy" in line for line in lines)
+    # Neither the sampler nor the waiting caller shows up in the profile.
+    assert "sampling-profiler" not in stacks
+    assert not any("test_sampler_returns_stacks_of_other_threads" in line for line in lines)
+
+
+def test_sampler_refuses_overlapping_runs():
+    sampler = SamplingProfiler()
+    first = threading.Thread(target=sampler.run, args=(0.3,))
+    first.start()
+    time.sleep(0.05)
+    assert sampler.run(0.1) is None
+    first.join()
+
+
+def test_route_reports_merge_every_worker(tmp_path, monkeypatch):
+    workers = [RouteProfiler(tmp_path), RouteProfiler(tmp_path)]
+    for pid, route_profiler in zip((101, 202), workers):
+        monkeypatch.setattr(profiling.os, "getpid", lambda pid=pid: pid)
+        profiler = route_profiler.start()
+        sum(range(1000))
+        route_profiler.stop("/api/status", profiler)
+
+    report = workers[0].report("/api/status")
+    assert "# /api/status (2 sampled requests from 2 worker(s))" in report
+
+    workers[1].reset()
+    assert workers[0].report(None) == "no samples\n"
+
+
+def _debug_client(token="secret"):
+    app = Flask(__name__)
+    setup_request_hooks(app, logging.getLogger("test"), ObservabilityConfig(admin_token=token))
+    return app.test_client()
+
+
+def test_profile_endpoint_returns_stacks_in_the_same_request():
+    client = _debug_client()
+    response = client.get("/debug/profile?seconds=0.2", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert response.headers["X-Profiled-PID"]
+
+
+def test_bad_or_non_ascii_admin_token_is_forbidden():
+    client = _debug_client()
+    for token in ("wrong", "sécret"):
+        headers = {"X-Admin-Token": token.encode("utf-8").decode("latin-1")}
+        assert client.get("/debug/cprofile", headers=headers).status_code == 403
+
+
+def test_debug_endpoints_hidden_without_admin_token():
+    assert _debug_client(token=None).get("/debug/profile").status_code == 404
@@ -0,0 +1,113 @@
+import threading
+import time
+
+from prometheus_client import REGISTRY
+
+from concierge_app import tts as tts_module
+from concierge_app.singleflight import SingleFlight
+from concierge_app.tts import SpeechService
+
+
+N = 8
+
+
+def _deduplicated(group):
+    return REGISTRY.get_sample_value("concierge_singleflight_deduplicated_total", {"group": group}) or 0.0
+
+
+def _run_concurrently(flight, group, fn):
+    """Start N identical calls, release the leader once all followers have joined."""
+    release = threading.Event()
+    before = _deduplicated(group)
+    outcomes = []
+    lock = threading.Lock()
+
+    def leader_fn():
+        release.wait(5)
+        return fn()
+
+    def caller():
+        try:
+            result = ("ok", flight.do("same-key", leader_fn))
+        except Exception as exc:
+            result = ("error", exc)
+        with lock:
+            outcomes.append(result)
+
+    threads = [threading.Thread(target=caller) for _ in range(N)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while _deduplicated(group) - before < N - 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    return outcomes, _deduplicated(group) - before
+
+
+def test_concurrent_identical_calls_share_one_result():
+    flight = SingleFlight("test-result")
+    runs = []
+
+    def fn():
+        runs.append(1)
+        return object()
+
+    outcomes, deduplicated = _run_concurrently(flight, "test-result", fn)
+
+    assert len(runs) == 1
+    assert deduplicated == N - 1
+    assert len(outcomes) == N
+    assert len({id(value) for kind, value in outcomes if kind == "ok"}) == 1
+
+
+def test_concurrent_identical_calls_share_the_leaders_exception():
+    flight = SingleFlight("test-error")
+    runs = []
+    boom = RuntimeError("backend down")
+
+    def fn():
+        runs.append(1)
+        raise boom
+
+    outcomes, deduplicated = _run_concurrently(flight, "test-error", fn)
+
+    assert len(runs) == 1
+    assert deduplicated == N - 1
+    assert outcomes == [("error", boom)] * N
+
+
+def test_key_is_released_after_the_call_finishes():
+    flight = SingleFlight("test-release")
+    runs = []
+    flight.do("k", lambda: runs.append(1))
+    flight.do("k", lambda: runs.append(1))
+    assert len(runs) == 2
+
+
+def test_tts_client_initializes_once_under_burst(monkeypatch):
+    created = []
+
+    def slow_client():
+        time.sleep(0.1)
+        created.append(1)
+        return object()
+
+    monkeypatch.setattr(tts_module.texttospeech, "TextToSpeechClient", slow_client)
+    service = SpeechService()
+    start = threading.Barrier(N)
+    results = []
+
+    def burst():
+        start.wait()
+        results.append(service._ensure_client())
+
+    threads = [threading.Thread(target=burst) for _ in range(N)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert results == [True] * N